@@ -4,6 +4,7 @@ Frontend application for displaying and filtering SaaS startup signals
 Production-ready for Streamlit Cloud deployment
 """
 
+import logging
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -13,6 +14,8 @@ import time
 from main import SaaSSignalMiner
 from utils import get_fallback_data, format_startup_data
 
+logging.basicConfig(level=logging.INFO)
+
 # Page configuration
 st.set_page_config(
     page_title="SaaS Signal Miner",
@@ -31,47 +34,75 @@ st.markdown("""
         text-align: center;
         margin-bottom: 2rem;
     }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #1f77b4;
-    }
-    .startup-card {
-        background-color: white;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border: 1px solid #e0e0e0;
-        margin-bottom: 1rem;
-    }
-    .score-high { color: #28a745; font-weight: bold; }
-    .score-medium { color: #ffc107; font-weight: bold; }
-    .score-low { color: #dc3545; font-weight: bold; }
 </style>
 """, unsafe_allow_html=True)
 
+# Low-cardinality columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ('sector', 'funding_stage', 'signal_type')
+
+# Columns shown in the "Top SaaS Startups" table, in display order
+STARTUP_TABLE_COLUMNS = {
+    'name': st.column_config.TextColumn("Startup"),
+    'score': st.column_config.NumberColumn("Growth Score"),
+    'description': st.column_config.TextColumn("Description"),
+    'growth_reason': st.column_config.TextColumn("Growth Reason"),
+    'sector': st.column_config.TextColumn("Sector"),
+    'funding_stage': st.column_config.TextColumn("Stage"),
+    'signal_type': st.column_config.TextColumn("Signal"),
+    'source_link': st.column_config.LinkColumn("Source"),
+}
+
+@st.cache_resource
+def get_miner():
+    """
+    Get a shared SaaSSignalMiner so its API client is built once per process
+    """
+    return SaaSSignalMiner()
+
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def load_startup_data():
     """
     Load startup data with caching to avoid repeated API calls
+    
+    Returns a DataFrame with the low-cardinality text columns stored as
+    categoricals, which keeps filtering and value counts cheap, together with
+    the sidebar filter options so they share this cache entry.
     """
     try:
-        miner = SaaSSignalMiner()
+        miner = get_miner()
         startups = miner.scan_for_startups()
-        return startups
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return format_startup_data(get_fallback_data())
+        startups = format_startup_data(get_fallback_data())
+    
+    startups_df = pd.DataFrame([startup.to_dict() for startup in startups])
+    if startups_df.empty:
+        return startups_df, ()
+    startups_df = startups_df.astype({column: 'category' for column in CATEGORICAL_COLUMNS})
+    return startups_df, get_filter_options(startups_df)
+
+def get_filter_options(startups_df):
+    """Get the sidebar dropdown options from the categorical columns"""
+    return tuple(
+        ["All"] + sorted(startups_df[column].cat.categories.tolist())
+        for column in CATEGORICAL_COLUMNS
+    )
 
-def get_score_color(score):
-    """Get color class based on score"""
+def count_values(values):
+    """Count values, dropping categories that no longer occur after filtering"""
+    counts = values.value_counts()
+    return counts[counts > 0]
+
+def get_score_style(score):
+    """Get the cell CSS for a growth score"""
     if score >= 80:
-        return "score-high"
+        return "color: #28a745; font-weight: bold"
     elif score >= 60:
-        return "score-medium"
+        return "color: #ffc107; font-weight: bold"
     else:
-        return "score-low"
+        return "color: #dc3545; font-weight: bold"
 
+@st.cache_data(ttl=300)
 def create_score_chart(startups_df):
     """Create a score distribution chart"""
     fig = px.histogram(
@@ -89,9 +120,10 @@ def create_score_chart(startups_df):
     )
     return fig
 
+@st.cache_data(ttl=300)
 def create_sector_chart(startups_df):
     """Create a sector distribution chart"""
-    sector_counts = startups_df['sector'].value_counts()
+    sector_counts = count_values(startups_df['sector'])
     fig = px.pie(
         values=sector_counts.values,
         names=sector_counts.index,
@@ -101,9 +133,10 @@ def create_sector_chart(startups_df):
     fig.update_traces(textposition='inside', textinfo='percent+label')
     return fig
 
+@st.cache_data(ttl=300)
 def create_signal_type_chart(startups_df):
     """Create a signal type distribution chart"""
-    signal_counts = startups_df['signal_type'].value_counts()
+    signal_counts = count_values(startups_df['signal_type'])
     fig = px.bar(
         x=signal_counts.index,
         y=signal_counts.values,
@@ -131,19 +164,14 @@ def main():
     
     # Load data
     with st.spinner("Scanning for SaaS startups..."):
-        startups = load_startup_data()
+        startups_df, filter_options = load_startup_data()
     
-    if not startups:
+    if startups_df.empty:
         st.error("No startup data available. Please check your API configuration.")
         return
     
-    # Convert to DataFrame for easier manipulation
-    startups_df = pd.DataFrame(startups)
-    
     # Get unique values for filters
-    sectors = ["All"] + sorted(startups_df['sector'].unique().tolist())
-    funding_stages = ["All"] + sorted(startups_df['funding_stage'].unique().tolist())
-    signal_types = ["All"] + sorted(startups_df['signal_type'].unique().tolist())
+    sectors, funding_stages, signal_types = filter_options
     
     # Sidebar filters
     selected_sector = st.sidebar.selectbox("Sector", sectors)
@@ -152,22 +180,20 @@ def main():
     min_score = st.sidebar.slider("Minimum Growth Score", 0, 100, 0, 5)
     
     # Filter data
-    miner = SaaSSignalMiner()
-    filtered_startups = miner.filter_startups(
-        startups,
+    miner = get_miner()
+    filtered_df = miner.filter_startups_df(
+        startups_df,
         sector=selected_sector if selected_sector != "All" else None,
         funding_stage=selected_funding_stage if selected_funding_stage != "All" else None,
         signal_type=selected_signal_type if selected_signal_type != "All" else None,
         min_score=min_score
     )
     
-    filtered_df = pd.DataFrame(filtered_startups)
-    
     # Main content area
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Startups", len(filtered_startups))
+        st.metric("Total Startups", len(filtered_df))
     
     with col2:
         avg_score = filtered_df['score'].mean() if not filtered_df.empty else 0
@@ -187,21 +213,19 @@ def main():
     
     st.markdown("---")
     
-    # Charts section
+    # Charts section (each chart only receives the column it plots so the
+    # cache key stays small and is unaffected by unrelated columns)
     if not filtered_df.empty:
         col1, col2 = st.columns(2)
         
         with col1:
-            score_chart = create_score_chart(filtered_df)
-            st.plotly_chart(score_chart, use_container_width=True)
+            st.plotly_chart(create_score_chart(filtered_df[['score']]), use_container_width=True)
         
         with col2:
-            sector_chart = create_sector_chart(filtered_df)
-            st.plotly_chart(sector_chart, use_container_width=True)
+            st.plotly_chart(create_sector_chart(filtered_df[['sector']]), use_container_width=True)
         
         # Signal type chart
-        signal_chart = create_signal_type_chart(filtered_df)
-        st.plotly_chart(signal_chart, use_container_width=True)
+        st.plotly_chart(create_signal_type_chart(filtered_df[['signal_type']]), use_container_width=True)
     
     st.markdown("---")
     
@@ -211,34 +235,14 @@ def main():
     if filtered_df.empty:
         st.warning("No startups match the selected filters.")
     else:
-        # Display startups in a table format
-        for idx, startup in filtered_df.iterrows():
-            with st.container():
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class="startup-card">
-                        <h3>{startup['name']}</h3>
-                        <p><strong>Description:</strong> {startup['description']}</p>
-                        <p><strong>Growth Reason:</strong> {startup['growth_reason']}</p>
-                        <p><strong>Sector:</strong> {startup['sector']} | 
-                           <strong>Stage:</strong> {startup['funding_stage']} | 
-                           <strong>Signal:</strong> {startup['signal_type']}</p>
-                        <p><strong>Source:</strong> <a href="{startup['source_link']}" target="_blank">{startup['source_link']}</a></p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    score_class = get_score_color(startup['score'])
-                    st.markdown(f"""
-                    <div class="metric-card">
-                        <h2 class="{score_class}">{startup['score']}</h2>
-                        <p>Growth Score</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown("---")
+        # Send the whole list as one Arrow-serialized table
+        table_df = filtered_df[list(STARTUP_TABLE_COLUMNS)]
+        st.dataframe(
+            table_df.style.map(get_score_style, subset=['score']),
+            use_container_width=True,
+            hide_index=True,
+            column_config=STARTUP_TABLE_COLUMNS
+        )
     
     # Footer
     st.markdown("---")
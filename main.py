@@ -5,10 +5,24 @@ Scans for high-potential early-stage SaaS startups using public signals
 
 import os
 import json
-from typing import List, Dict, Any, Optional
+import logging
+from contextlib import closing
+from itertools import islice
+import numpy as np
+import pandas as pd
+from typing import List, Optional
 from dotenv import load_dotenv
 from perplexity_client import PerplexityClient
-from utils import parse_saas_startups_response, format_startup_data, get_fallback_data
+from utils import (
+    Startup,
+    parse_saas_startups_response,
+    iter_streamed_startups,
+    validate_startups,
+    format_startup_data,
+    get_fallback_data,
+)
+
+log = logging.getLogger(__name__)
 
 # Load environment variables only for local development
 # In production, Streamlit secrets will be used
@@ -17,6 +31,31 @@ try:
 except Exception:
     pass  # Ignore if .env file doesn't exist
 
+# Number of startups requested from the API; streaming stops once this many are parsed
+MAX_STARTUPS = 10
+
+# Query sent to the LLM when scanning for startups
+STARTUP_QUERY = f"""Give me {MAX_STARTUPS} early-stage SaaS startups that are likely to experience significant growth based on recent public signals. 
+
+For each startup, provide the following information in JSON format:
+- name: Company name
+- description: Brief description of what they do
+- growth_reason: Specific reason why they show growth potential (funding, partnerships, market trends, etc.)
+- source_link: URL or source of the signal
+- sector: Industry sector
+- funding_stage: Current funding stage
+- signal_type: Type of signal (funding, partnership, acquisition, market demand, etc.)
+
+Focus on startups that have shown recent activity like:
+- Recent funding rounds
+- Strategic partnerships
+- Product launches
+- Market expansion
+- Regulatory changes affecting their sector
+- Industry trends favoring their solution
+
+Return the data as a JSON array with these exact field names."""
+
 class SaaSSignalMiner:
     """
     Main class for mining SaaS startup signals using Perplexity API
@@ -28,9 +67,9 @@ class SaaSSignalMiner:
         self.client = None
         try:
             self.client = PerplexityClient()
-            print("✅ PerplexityClient initialized successfully")
+            log.info("✅ PerplexityClient initialized successfully")
         except Exception as e:
-            print(f"Error initializing PerplexityClient: {e}")
+            log.error("Error initializing PerplexityClient: %s", e)
             self.client = None
     
     def generate_startup_query(self) -> str:
@@ -40,116 +79,145 @@ class SaaSSignalMiner:
         Returns:
             str: Formatted query for the LLM
         """
-        return """Give me 10 early-stage SaaS startups that are likely to experience significant growth based on recent public signals. 
+        return STARTUP_QUERY
 
-For each startup, provide the following information in JSON format:
-- name: Company name
-- description: Brief description of what they do
-- growth_reason: Specific reason why they show growth potential (funding, partnerships, market trends, etc.)
-- source_link: URL or source of the signal
-- sector: Industry sector
-- funding_stage: Current funding stage
-- signal_type: Type of signal (funding, partnership, acquisition, market demand, etc.)
-
-Focus on startups that have shown recent activity like:
-- Recent funding rounds
-- Strategic partnerships
-- Product launches
-- Market expansion
-- Regulatory changes affecting their sector
-- Industry trends favoring their solution
-
-Return the data as a JSON array with these exact field names."""
-
-    def scan_for_startups(self) -> List[Dict[str, Any]]:
+    def scan_for_startups(self) -> List[Startup]:
         """
         Scan for high-potential SaaS startups using Perplexity API
         
         Returns:
-            List[Dict[str, Any]]: List of startup data with growth scores
+            List[Startup]: List of startup data with growth scores
         """
         if not self.client:
-            print("Warning: No API key configured or API initialization failed. Using fallback data.")
+            log.warning("No API key configured or API initialization failed. Using fallback data.")
             return format_startup_data(get_fallback_data())
         
         try:
             # Generate the query
             query = self.generate_startup_query()
             
-            # Make API call
-            print("Scanning for SaaS startups using Perplexity API...")
-            response = self.client.ask(query)
+            # Stream the API response, picking startups out as each one completes
+            log.info("Scanning for SaaS startups using Perplexity API...")
+            # Raw text is only needed by the full-text fallback, which cannot run
+            # once a startup has been parsed, so stop keeping it at that point
+            raw_chunks = []
+            startups = []
+            
+            def record(stream):
+                for chunk in stream:
+                    if not startups:
+                        raw_chunks.append(chunk)
+                    yield chunk
             
-            # Parse the response
-            print(f"Received response from API (length: {len(response)})")
+            with closing(self.client.ask_stream(query)) as stream:
+                for startup in islice(iter_streamed_startups(record(stream)), MAX_STARTUPS):
+                    if not startups:
+                        raw_chunks.clear()
+                    startups.append(startup)
             
-            # Parse and format the startup data
-            startups = parse_saas_startups_response(response)
+            # Parse and format the startup data, falling back to the full-text
+            # parser when no JSON array was streamed
+            if startups:
+                startups = validate_startups(startups)
+            else:
+                response = "".join(raw_chunks)
+                log.debug("Received unstructured response from API (length: %d)", len(response))
+                startups = parse_saas_startups_response(response)
             formatted_startups = format_startup_data(startups)
             
-            print(f"Successfully parsed {len(formatted_startups)} startups")
+            log.info("Successfully parsed %d startups", len(formatted_startups))
             return formatted_startups
             
         except Exception as e:
-            print(f"Error scanning for startups: {e}")
-            print("Falling back to dummy data...")
+            log.error("Error scanning for startups: %s", e)
+            log.warning("Falling back to dummy data...")
             return format_startup_data(get_fallback_data())
     
-    def filter_startups(self, startups: List[Dict[str, Any]], 
+    def filter_startups(self, startups: List[Startup], 
                        sector: Optional[str] = None,
                        funding_stage: Optional[str] = None,
                        signal_type: Optional[str] = None,
-                       min_score: int = 0) -> List[Dict[str, Any]]:
+                       min_score: int = 0) -> List[Startup]:
         """
         Filter startups based on criteria
         
         Args:
-            startups (List[Dict[str, Any]]): List of startups to filter
+            startups (List[Startup]): List of startups to filter
             sector (Optional[str]): Filter by sector
             funding_stage (Optional[str]): Filter by funding stage
             signal_type (Optional[str]): Filter by signal type
             min_score (int): Minimum growth score
             
         Returns:
-            List[Dict[str, Any]]: Filtered list of startups
+            List[Startup]: Filtered list of startups
         """
-        filtered_startups = startups.copy()
+        if not startups:
+            return []
         
-        # Filter by sector
-        if sector and sector != "All":
-            filtered_startups = [
-                s for s in filtered_startups 
-                if s.get('sector', '').lower() == sector.lower()
-            ]
+        filtered_df = self.filter_startups_df(
+            pd.DataFrame([startup.to_dict() for startup in startups]),
+            sector=sector,
+            funding_stage=funding_stage,
+            signal_type=signal_type,
+            min_score=min_score
+        )
+        # The frame has a RangeIndex over the input, so labels map back to records
+        return [startups[i] for i in filtered_df.index]
+    
+    def filter_startups_df(self, startups_df: pd.DataFrame,
+                           sector: Optional[str] = None,
+                           funding_stage: Optional[str] = None,
+                           signal_type: Optional[str] = None,
+                           min_score: int = 0) -> pd.DataFrame:
+        """
+        Filter a DataFrame of startups based on criteria
         
-        # Filter by funding stage
-        if funding_stage and funding_stage != "All":
-            filtered_startups = [
-                s for s in filtered_startups 
-                if s.get('funding_stage', '').lower() == funding_stage.lower()
-            ]
+        Categorical columns are matched against their categories, so each
+        filter costs one comparison per distinct value rather than per row.
+        
+        Args:
+            startups_df (pd.DataFrame): Startups to filter
+            sector (Optional[str]): Filter by sector
+            funding_stage (Optional[str]): Filter by funding stage
+            signal_type (Optional[str]): Filter by signal type
+            min_score (int): Minimum growth score
+            
+        Returns:
+            pd.DataFrame: Filtered startups
+        """
+        if startups_df.empty:
+            return startups_df
         
-        # Filter by signal type
-        if signal_type and signal_type != "All":
-            filtered_startups = [
-                s for s in filtered_startups 
-                if s.get('signal_type', '').lower() == signal_type.lower()
-            ]
+        scores = startups_df['score']
+        if scores.is_monotonic_decreasing:
+            # format_startup_data sorts startups by score (highest first), so the min_score
+            # cutoff is a binary search over a reversed view instead of a full scan
+            cutoff = len(scores) - np.searchsorted(scores.to_numpy()[::-1], min_score, side='left')
+            startups_df = startups_df.iloc[:cutoff]
+            mask = pd.Series(True, index=startups_df.index)
+        else:
+            mask = scores.fillna(0).ge(min_score)
         
-        # Filter by minimum score
-        filtered_startups = [
-            s for s in filtered_startups 
-            if s.get('score', 0) >= min_score
-        ]
+        # Build a single boolean mask instead of re-scanning the data per filter
+        for column, value in (('sector', sector),
+                              ('funding_stage', funding_stage),
+                              ('signal_type', signal_type)):
+            if value and value != "All":
+                values = startups_df[column]
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    categories = values.cat.categories
+                    mask &= values.isin(categories[categories.str.lower() == value.lower()])
+                else:
+                    mask &= values.fillna('').str.lower().eq(value.lower())
         
-        return filtered_startups
+        return startups_df[mask]
     
-    def get_unique_values(self, startups: List[Dict[str, Any]], field: str) -> List[str]:
+    def get_unique_values(self, startups: List[Startup], field: str) -> List[str]:
         """
         Get unique values for a specific field from startup data
         
         Args:
-            startups (List[Dict[str, Any]]): List of startups
+            startups (List[Startup]): List of startups
             field (str): Field name to extract unique values from
             
         Returns:
@@ -157,7 +225,7 @@ Return the data as a JSON array with these exact field names."""
         """
         values = set()
         for startup in startups:
-            value = startup.get(field, '')
+            value = getattr(startup, field, '')
             if value:
                 values.add(value)
         
@@ -181,12 +249,12 @@ def main():
     print("-" * 50)
     
     for i, startup in enumerate(startups[:5], 1):  # Show top 5
-        print(f"{i}. {startup['name']}")
-        print(f"   Score: {startup['score']}")
-        print(f"   Sector: {startup['sector']}")
-        print(f"   Stage: {startup['funding_stage']}")
-        print(f"   Signal: {startup['signal_type']}")
-        print(f"   Reason: {startup['growth_reason']}")
+        print(f"{i}. {startup.name}")
+        print(f"   Score: {startup.score}")
+        print(f"   Sector: {startup.sector}")
+        print(f"   Stage: {startup.funding_stage}")
+        print(f"   Signal: {startup.signal_type}")
+        print(f"   Reason: {startup.growth_reason}")
         print()
     
     # Test filtering
@@ -200,4 +268,5 @@ def main():
     print("\n✅ Core logic test completed!")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main() 
\ No newline at end of file
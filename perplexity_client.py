@@ -1,14 +1,48 @@
 import os
+import threading
+from functools import lru_cache
+import orjson
 import requests
-from typing import Optional
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Iterator, Optional
 import streamlit as st
 
 
+@lru_cache(maxsize=None)
+def _read_secrets_api_key() -> Optional[str]:
+    """
+    Read the Perplexity API key from Streamlit secrets, if configured.
+    
+    Called lazily from the first client construction rather than at import time:
+    touching st.secrets before st.set_page_config renders a "No secrets files found"
+    error when no secrets.toml exists. The result is memoized so re-created clients
+    skip the secrets access; call _read_secrets_api_key.cache_clear() to pick up a rotated key.
+    """
+    try:
+        return st.secrets["API"]["PERPLEXITY_API_KEY"]
+    except (KeyError, AttributeError, FileNotFoundError):
+        return None
+
+
+class PerplexityAPIError(Exception):
+    """Raised when the Perplexity API answers with a non-200 status."""
+    
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Perplexity API returned {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
 class PerplexityClient:
     """
     A simple client for interacting with the Perplexity AI API using pure requests.
     """
     
+    # Pooled sessions shared across instances (Streamlit reruns re-create the client),
+    # keyed by API key so the Authorization header can live on the session itself
+    _sessions: Dict[str, requests.Session] = {}
+    _session_lock = threading.Lock()
+    
     def __init__(self, api_key: Optional[str] = None):
         """
         Initialize the Perplexity client.
@@ -17,21 +51,39 @@ class PerplexityClient:
             api_key: Perplexity API key. If not provided, reads from Streamlit secrets or PERPLEXITY_API_KEY env var.
         """
         # Priority: passed api_key > Streamlit secrets > environment variable
-        if api_key:
-            self.api_key = api_key
-        else:
-            # Try Streamlit secrets first (for production)
-            try:
-                self.api_key = st.secrets["API"]["PERPLEXITY_API_KEY"]
-            except (KeyError, AttributeError):
-                # Fallback to environment variable (for local development)
-                self.api_key = os.getenv('PERPLEXITY_API_KEY')
+        # Streamlit secrets are used in production, the environment variable for local development
+        self.api_key = api_key or _read_secrets_api_key() or os.getenv('PERPLEXITY_API_KEY')
         
         if not self.api_key:
             raise ValueError("Perplexity API key is required. Set PERPLEXITY_API_KEY in Streamlit secrets or environment variable, or pass api_key parameter.")
         
         self.base_url = "https://api.perplexity.ai/chat/completions"
         self.model = "llama-3-sonar-large-32k"
+        self.timeout = 30.0
+        self._session = self._get_session(self.api_key)
+    
+    @classmethod
+    def _get_session(cls, api_key: str) -> requests.Session:
+        """
+        Return the shared keep-alive session for an API key, creating it on first use.
+        
+        Args:
+            api_key: Perplexity API key used for the session's Authorization header
+            
+        Returns:
+            A requests.Session with a pooled HTTPAdapter mounted for HTTPS
+        """
+        with cls._session_lock:
+            session = cls._sessions.get(api_key)
+            if session is None:
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=10))
+                session.headers.update({
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json"
+                })
+                cls._sessions[api_key] = session
+            return session
         
     def ask(self, prompt: str, system_prompt: str = "You are a helpful assistant.") -> str:
         """
@@ -45,15 +97,68 @@ class PerplexityClient:
             The model's response as a plain string
             
         Raises:
-            requests.RequestException: If the API request fails
-            ValueError: If the response is invalid
+            PerplexityAPIError: If the API answers with a non-200 status
+            requests.RequestException: If the request cannot be sent
+            ValueError: If the body is not JSON (orjson.JSONDecodeError) or lacks choices[0].message.content
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        payload = self._build_payload(prompt, system_prompt, stream=False)
+        
+        response = self._session.post(self.base_url, data=orjson.dumps(payload), timeout=self.timeout)
+        if response.status_code != 200:
+            raise PerplexityAPIError(response.status_code, response.text[:200])
+        
+        data = orjson.loads(response.content)
         
-        payload = {
+        try:
+            return data['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError("Invalid response format from Perplexity API") from e
+    
+    def ask_stream(self, prompt: str, system_prompt: str = "You are a helpful assistant.") -> Iterator[str]:
+        """
+        Send a prompt to the Perplexity API and yield the response as it streams in.
+        
+        Args:
+            prompt: The user's question or prompt
+            system_prompt: The system message to set context
+            
+        Yields:
+            Chunks of the model's response text, in order
+            
+        Raises:
+            PerplexityAPIError: If the API answers with a non-200 status
+            requests.RequestException: If the request cannot be sent
+            ValueError: If an event is not JSON (orjson.JSONDecodeError) or its choices are malformed
+        """
+        payload = self._build_payload(prompt, system_prompt, stream=True)
+        
+        with self._session.post(self.base_url, data=orjson.dumps(payload),
+                                timeout=self.timeout, stream=True) as response:
+            if response.status_code != 200:
+                raise PerplexityAPIError(response.status_code, response.text[:200])
+            
+            # Server-sent events: one "data: {...}" line per delta, ending with "data: [DONE]"
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                event = line[len(b"data:"):].strip()
+                if event == b"[DONE]":
+                    break
+                
+                data = orjson.loads(event)
+                try:
+                    if not data.get('choices'):
+                        continue
+                    content = data['choices'][0].get('delta', {}).get('content')
+                except (KeyError, IndexError, TypeError, AttributeError) as e:
+                    raise ValueError("Invalid stream event format from Perplexity API") from e
+                
+                if content:
+                    yield content
+    
+    def _build_payload(self, prompt: str, system_prompt: str, stream: bool) -> Dict[str, Any]:
+        """Build the chat completions request body."""
+        return {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": system_prompt},
@@ -61,21 +166,5 @@ class PerplexityClient:
             ],
             "max_tokens": 4000,
             "temperature": 0.2,
-            "stream": False
+            "stream": stream
         }
-        
-        try:
-            response = requests.post(self.base_url, headers=headers, json=payload)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if 'choices' not in data or not data['choices']:
-                raise ValueError("Invalid response format from Perplexity API")
-            
-            return data['choices'][0]['message']['content']
-            
-        except requests.RequestException as e:
-            raise requests.RequestException(f"API request failed: {str(e)}")
-        except (KeyError, ValueError) as e:
-            raise ValueError(f"Invalid response format: {str(e)}") 
\ No newline at end of file
@@ -4,13 +4,33 @@ Optional database persistence for storing startup data and trends
 """
 
 import os
+import logging
+import pandas as pd
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from dotenv import load_dotenv
+from utils import Startup
+
+log = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# Columns written to the startups table by store_startups
+STARTUP_FIELDS = (
+    'name',
+    'description',
+    'growth_reason',
+    'source_link',
+    'sector',
+    'funding_stage',
+    'signal_type',
+    'score',
+)
+
+# PostgREST / Postgres error codes meaning the startup_trends function does not exist
+MISSING_FUNCTION_CODES = ('PGRST202', '42883')
+
 class SupabaseClient:
     """
     Supabase client for storing and retrieving SaaS startup data
@@ -21,62 +41,56 @@ class SupabaseClient:
         self.supabase_url = os.getenv('SUPABASE_URL')
         self.supabase_key = os.getenv('SUPABASE_KEY')
         self.client = None
+        # Cleared the first time the optional startup_trends function is missing,
+        # so later calls go straight to the local aggregation
+        self._trends_rpc_available = True
         
         if self.supabase_url and self.supabase_key:
             try:
                 from supabase import create_client
                 self.client = create_client(self.supabase_url, self.supabase_key)
-                print("✅ Supabase client initialized successfully")
+                log.info("✅ Supabase client initialized successfully")
             except ImportError:
-                print("⚠️ Supabase package not installed. Run: pip install supabase")
+                log.warning("⚠️ Supabase package not installed. Run: pip install supabase")
             except Exception as e:
-                print(f"❌ Error initializing Supabase client: {e}")
+                log.error("❌ Error initializing Supabase client: %s", e)
         else:
-            print("⚠️ Supabase credentials not found in .env file")
+            log.warning("⚠️ Supabase credentials not found in .env file")
     
     def is_connected(self) -> bool:
         """Check if Supabase client is connected"""
         return self.client is not None
     
-    def store_startups(self, startups: List[Dict[str, Any]]) -> bool:
+    def store_startups(self, startups: List[Startup]) -> bool:
         """
         Store startup data in Supabase
         
         Args:
-            startups (List[Dict[str, Any]]): List of startup data
+            startups (List[Startup]): List of startup data
             
         Returns:
             bool: True if successful, False otherwise
         """
         if not self.is_connected():
-            print("❌ Supabase not connected")
+            log.error("❌ Supabase not connected")
             return False
         
         try:
-            # Prepare data for storage
-            startup_records = []
-            for startup in startups:
-                record = {
-                    'name': startup.get('name'),
-                    'description': startup.get('description'),
-                    'growth_reason': startup.get('growth_reason'),
-                    'source_link': startup.get('source_link'),
-                    'sector': startup.get('sector'),
-                    'funding_stage': startup.get('funding_stage'),
-                    'signal_type': startup.get('signal_type'),
-                    'score': startup.get('score'),
-                    'timestamp': datetime.now().isoformat()
-                }
-                startup_records.append(record)
+            # Project each startup onto the table columns; the timestamp column
+            # is filled in by the database (DEFAULT NOW())
+            startup_records = [
+                {field: getattr(startup, field) for field in STARTUP_FIELDS}
+                for startup in startups
+            ]
             
             # Insert data into startups table
             result = self.client.table('startups').insert(startup_records).execute()
             
-            print(f"✅ Stored {len(startup_records)} startups in Supabase")
+            log.info("✅ Stored %d startups in Supabase", len(startup_records))
             return True
             
         except Exception as e:
-            print(f"❌ Error storing startups: {e}")
+            log.error("❌ Error storing startups: %s", e)
             return False
     
     def get_startups(self, limit: int = 100) -> List[Dict[str, Any]]:
@@ -90,7 +104,7 @@ class SupabaseClient:
             List[Dict[str, Any]]: List of startup data
         """
         if not self.is_connected():
-            print("❌ Supabase not connected")
+            log.error("❌ Supabase not connected")
             return []
         
         try:
@@ -98,7 +112,7 @@ class SupabaseClient:
             return result.data if result.data else []
             
         except Exception as e:
-            print(f"❌ Error retrieving startups: {e}")
+            log.error("❌ Error retrieving startups: %s", e)
             return []
     
     def get_startup_trends(self, days: int = 30) -> Dict[str, Any]:
@@ -112,40 +126,46 @@ class SupabaseClient:
             Dict[str, Any]: Trend data
         """
         if not self.is_connected():
-            print("❌ Supabase not connected")
+            log.error("❌ Supabase not connected")
             return {}
         
         try:
-            # Get startups from the last N days
+            # Prefer aggregating in Postgres so only the grouped counts travel over the wire
+            if self._trends_rpc_available:
+                try:
+                    trends = self.client.rpc('startup_trends', {'days': days}).execute().data
+                    if not trends or not trends.get('total_startups'):
+                        return {}
+                    trends['period_days'] = days
+                    return trends
+                except Exception as e:
+                    # Only a missing function disables the RPC; timeouts and server
+                    # errors fall back to local aggregation for this call alone
+                    if getattr(e, 'code', None) in MISSING_FUNCTION_CODES:
+                        self._trends_rpc_available = False
+                    log.warning("⚠️ startup_trends RPC unavailable, aggregating locally: %s", e)
+            
+            # Get startups from the last N days, fetching only the aggregated columns
             from datetime import timedelta
             cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
             
-            result = self.client.table('startups').select('*').gte('timestamp', cutoff_date).execute()
+            result = self.client.table('startups').select('score,sector,signal_type').gte('timestamp', cutoff_date).execute()
             
             if not result.data:
                 return {}
             
-            # Calculate trends
-            startups = result.data
+            # Calculate trends with column-wise pandas aggregations
+            startups_df = pd.DataFrame(result.data, columns=['score', 'sector', 'signal_type'])
             
             # Average score trend
-            scores = [s.get('score', 0) for s in startups]
-            avg_score = sum(scores) / len(scores) if scores else 0
+            avg_score = float(startups_df['score'].fillna(0).mean())
             
-            # Sector distribution
-            sectors = {}
-            for startup in startups:
-                sector = startup.get('sector', 'Unknown')
-                sectors[sector] = sectors.get(sector, 0) + 1
-            
-            # Signal type distribution
-            signal_types = {}
-            for startup in startups:
-                signal_type = startup.get('signal_type', 'Unknown')
-                signal_types[signal_type] = signal_types.get(signal_type, 0) + 1
+            # Sector and signal type distributions
+            sectors = startups_df['sector'].fillna('Unknown').value_counts().to_dict()
+            signal_types = startups_df['signal_type'].fillna('Unknown').value_counts().to_dict()
             
             return {
-                'total_startups': len(startups),
+                'total_startups': len(startups_df),
                 'average_score': avg_score,
                 'sector_distribution': sectors,
                 'signal_type_distribution': signal_types,
@@ -153,7 +173,7 @@ class SupabaseClient:
             }
             
         except Exception as e:
-            print(f"❌ Error calculating trends: {e}")
+            log.error("❌ Error calculating trends: %s", e)
             return {}
     
     def create_tables(self) -> bool:
@@ -164,7 +184,7 @@ class SupabaseClient:
             bool: True if successful, False otherwise
         """
         if not self.is_connected():
-            print("❌ Supabase not connected")
+            log.error("❌ Supabase not connected")
             return False
         
         try:
@@ -188,12 +208,35 @@ class SupabaseClient:
             CREATE INDEX idx_startups_timestamp ON startups(timestamp);
             CREATE INDEX idx_startups_sector ON startups(sector);
             CREATE INDEX idx_startups_score ON startups(score);
+            
+            CREATE OR REPLACE FUNCTION startup_trends(days INTEGER)
+            RETURNS JSONB AS $$
+                WITH recent AS (
+                    SELECT score,
+                           COALESCE(sector, 'Unknown') AS sector,
+                           COALESCE(signal_type, 'Unknown') AS signal_type
+                    FROM startups
+                    WHERE timestamp >= NOW() - days * INTERVAL '1 day'
+                )
+                SELECT jsonb_build_object(
+                    'total_startups', (SELECT COUNT(*) FROM recent),
+                    'average_score', (SELECT COALESCE(AVG(COALESCE(score, 0)), 0) FROM recent),
+                    'sector_distribution', (
+                        SELECT COALESCE(jsonb_object_agg(sector, cnt), '{}'::jsonb)
+                        FROM (SELECT sector, COUNT(*) AS cnt FROM recent GROUP BY sector) s
+                    ),
+                    'signal_type_distribution', (
+                        SELECT COALESCE(jsonb_object_agg(signal_type, cnt), '{}'::jsonb)
+                        FROM (SELECT signal_type, COUNT(*) AS cnt FROM recent GROUP BY signal_type) t
+                    )
+                );
+            $$ LANGUAGE sql STABLE;
             """)
             
             return True
             
         except Exception as e:
-            print(f"❌ Error creating tables: {e}")
+            log.error("❌ Error creating tables: %s", e)
             return False
 
 # Global instance
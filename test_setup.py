@@ -3,70 +3,64 @@ Test script for SaaS Signal Miner setup
 Verifies all dependencies and basic functionality
 """
 
+import importlib.util
 import sys
 import os
-from pathlib import Path
+
+# (module name, display name, required) for each package checked by test_imports
+REQUIRED_PACKAGES = [
+    ("streamlit", "Streamlit", True),
+    ("pandas", "Pandas", True),
+    ("plotly", "Plotly", True),
+    ("dotenv", "Python-dotenv", True),
+    ("langchain_openai", "LangChain OpenAI", True),
+    ("supabase", "Supabase", False),
+]
 
 def test_imports():
-    """Test if all required packages can be imported"""
+    """Test if all required packages are installed"""
     print("🔍 Testing imports...")
     
-    try:
-        import streamlit
-        print("✅ Streamlit imported successfully")
-    except ImportError as e:
-        print(f"❌ Streamlit import failed: {e}")
-        return False
-    
-    try:
-        import pandas
-        print("✅ Pandas imported successfully")
-    except ImportError as e:
-        print(f"❌ Pandas import failed: {e}")
-        return False
-    
-    try:
-        import plotly
-        print("✅ Plotly imported successfully")
-    except ImportError as e:
-        print(f"❌ Plotly import failed: {e}")
-        return False
-    
-    try:
-        from dotenv import load_dotenv
-        print("✅ Python-dotenv imported successfully")
-    except ImportError as e:
-        print(f"❌ Python-dotenv import failed: {e}")
-        return False
-    
-    try:
-        from langchain_openai import ChatOpenAI
-        print("✅ LangChain OpenAI imported successfully")
-    except ImportError as e:
-        print(f"❌ LangChain OpenAI import failed: {e}")
-        return False
-    
-    try:
-        import supabase
-        print("✅ Supabase imported successfully")
-    except ImportError as e:
-        print(f"⚠️ Supabase import failed (optional): {e}")
+    # find_spec locates each package without executing its (heavy) module code
+    for module_name, display_name, required in REQUIRED_PACKAGES:
+        if importlib.util.find_spec(module_name) is not None:
+            print(f"✅ {display_name} found")
+        elif required:
+            print(f"❌ {display_name} not installed")
+            return False
+        else:
+            print(f"⚠️ {display_name} not installed (optional)")
     
     return True
 
 def test_env_file():
-    """Test if environment file exists and has required variables"""
+    """
+    Test if environment file exists and has required variables
+    
+    Passes without touching the filesystem when OPENAI_API_KEY is already set
+    to a real key; otherwise the .env file is required and loaded.
+    """
     print("\n🔍 Testing environment configuration...")
     
-    env_file = Path(".env")
-    if not env_file.exists():
+    # An API key already in the environment (e.g. CI secrets, or a previous
+    # load in this process) needs no .env file at all, unless it is the placeholder
+    env_api_key = os.environ.get('OPENAI_API_KEY')
+    if env_api_key == "your_perplexity_key_here":
+        print("❌ OPENAI_API_KEY in the environment is still the placeholder value")
+        print("   Please set it to your Perplexity API key")
+        return False
+    if env_api_key:
+        print("✅ OPENAI_API_KEY already set in the environment")
+        return True
+    
+    if not os.path.isfile(".env"):
         print("⚠️ .env file not found")
         print("   Please copy env_template.txt to .env and add your API key")
         return False
     
     # Load environment variables
     from dotenv import load_dotenv
-    load_dotenv()
+    load_dotenv(override=False)
     
     api_key = os.getenv('OPENAI_API_KEY')
     api_base = os.getenv('OPENAI_API_BASE')
@@ -127,7 +121,7 @@ def test_fallback_data():
         if formatted_data:
             sample = formatted_data[0]
             required_fields = ['name', 'description', 'growth_reason', 'source_link', 'score']
-            missing_fields = [field for field in required_fields if field not in sample]
+            missing_fields = [field for field in required_fields if not hasattr(sample, field)]
             
             if missing_fields:
                 print(f"❌ Missing required fields: {missing_fields}")
@@ -141,6 +135,42 @@ def test_fallback_data():
         print(f"❌ Fallback data test failed: {e}")
         return False
 
+# Streamed API response with prose brackets and citations around the JSON array,
+# a string value containing brackets, and a later array that must be ignored,
+# checked by test_streamed_parsing
+STREAMED_RESPONSE = (
+    'Here are the startups [see below], based on recent news [1][2]:\n'
+    '```json\n[\n'
+    '  {"name": "Alpha", "description": "Workflow tool [beta] for teams", "score": 88},\n'
+    '  {"name": "Beta", "sector": "FinTech", "score": 72}\n'
+    ']\n```\n'
+    'Sources: [1] https://example.com [2] https://example.org\n'
+    'Honourable mentions: [{"name": "Gamma"}]'
+)
+
+def test_streamed_parsing():
+    """Test incremental parsing of a streamed API response"""
+    print("\n🔍 Testing streamed response parsing...")
+    
+    try:
+        from utils import iter_streamed_startups
+        
+        # Small chunk sizes put chunk boundaries inside brackets, strings and elements
+        expected = ['Alpha', 'Beta']
+        for size in (1, 3, 7):
+            chunks = [STREAMED_RESPONSE[i:i + size] for i in range(0, len(STREAMED_RESPONSE), size)]
+            names = [startup.get('name') for startup in iter_streamed_startups(chunks)]
+            if names != expected:
+                print(f"❌ {size}-character chunks parsed {names}, expected {expected}")
+                return False
+        
+        print("✅ Streamed startups parsed across chunk boundaries")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Streamed parsing test failed: {e}")
+        return False
+
 def test_miner_initialization():
     """Test SaaSSignalMiner initialization"""
     print("\n🔍 Testing SaaSSignalMiner initialization...")
@@ -164,6 +194,16 @@ def test_miner_initialization():
         print(f"❌ SaaSSignalMiner test failed: {e}")
         return False
 
+def run_test(test_name, test_func):
+    """Run one test, reporting failures and exceptions, and return whether it passed"""
+    try:
+        if test_func():
+            return True
+        print(f"❌ {test_name} failed")
+    except Exception as e:
+        print(f"❌ {test_name} failed with exception: {e}")
+    return False
+
 def main():
     """Run all tests"""
     print("🚀 SaaS Signal Miner - Setup Test")
@@ -174,20 +214,13 @@ def main():
         ("Environment Configuration", test_env_file),
         ("Core Modules", test_core_modules),
         ("Fallback Data", test_fallback_data),
+        ("Streamed Parsing", test_streamed_parsing),
         ("Miner Initialization", test_miner_initialization)
     ]
     
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-            else:
-                print(f"❌ {test_name} failed")
-        except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
+    results = [(test_name, run_test(test_name, test_func)) for test_name, test_func in tests]
+    passed = sum(result for _, result in results)
+    total = len(results)
     
     print("\n" + "=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")
@@ -202,7 +235,7 @@ def main():
         print("\n🔧 Common fixes:")
         print("1. Run 'pip install -r requirements.txt'")
         print("2. Copy env_template.txt to .env and add your API key")
-        print("3. Check your Python version (3.8+ required)")
+        print("3. Check your Python version (3.10+ required)")
     
     return passed == total
 
@@ -4,11 +4,81 @@ Handles JSON parsing, data validation, and fallback data
 """
 
 import json
+import logging
 import re
-from typing import List, Dict, Any, Optional
+import sys
+import orjson
+from heapq import nlargest
+from dataclasses import dataclass, field, fields
+from operator import attrgetter
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
 
-def parse_saas_startups_response(response_text: str) -> List[Dict[str, str]]:
+log = logging.getLogger(__name__)
+
+_JSON_DECODER = json.JSONDecoder()
+# Longest token the decoder can report as an error while it is still arriving
+_MAX_PARTIAL_TOKEN = len('-Infinity')
+
+@dataclass(slots=True)
+class Startup:
+    """
+    A single startup record
+    
+    Slotted rather than dict-backed, so records stay small and attribute
+    access is cheap in the parse, score and filter loops. Defaults are the
+    values used when the LLM leaves a field out.
+    """
+    name: str = 'Unknown Startup'
+    description: str = 'No description available'
+    growth_reason: str = 'Growth signals detected'
+    source_link: str = 'https://example.com'
+    sector: str = 'Technology'
+    funding_stage: str = 'Early Stage'
+    signal_type: str = 'News'
+    score: Optional[int] = 75
+    timestamp: str = ''
+    
+    # Lowercased scoring fields, computed once at construction (records are
+    # not mutated after parsing, so these never go stale)
+    _funding_lc: str = field(init=False, repr=False, compare=False, default='')
+    _signal_lc: str = field(init=False, repr=False, compare=False, default='')
+    _sector_lc: str = field(init=False, repr=False, compare=False, default='')
+    
+    def __post_init__(self):
+        # sector, funding_stage and signal_type are low-cardinality, so share
+        # one string object per distinct value across records
+        if isinstance(self.sector, str):
+            self.sector = sys.intern(self.sector)
+        if isinstance(self.funding_stage, str):
+            self.funding_stage = sys.intern(self.funding_stage)
+        if isinstance(self.signal_type, str):
+            self.signal_type = sys.intern(self.signal_type)
+        
+        # Parsed values may be numbers, lists or null; those match no scoring keyword
+        self._funding_lc = self.funding_stage.lower() if isinstance(self.funding_stage, str) else ''
+        self._signal_lc = self.signal_type.lower() if isinstance(self.signal_type, str) else ''
+        self._sector_lc = self.sector.lower() if isinstance(self.sector, str) else ''
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict of the public fields for serialization boundaries"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+# Fields taken from parsed LLM output by validate_startups
+_PARSED_FIELDS = frozenset((
+    'name', 'description', 'growth_reason', 'source_link',
+    'sector', 'funding_stage', 'signal_type', 'score',
+))
+
+# Patterns used on every LLM response, compiled once at import time
+_ENTRY_SPLIT_RE = re.compile(r'\n\d+\.|\n•|\n-')
+_NAME_RE = re.compile(r'Name[:\s]+([^\n]+)', re.IGNORECASE)
+_DESC_RE = re.compile(r'Description[:\s]+([^\n]+)', re.IGNORECASE)
+_REASON_RE = re.compile(r'Reason[:\s]+([^\n]+)', re.IGNORECASE)
+_SOURCE_RE = re.compile(r'Source[:\s]+([^\n]+)', re.IGNORECASE)
+
+def parse_saas_startups_response(response_text: str) -> List[Startup]:
     """
     Parse the LLM response into structured startup data
     
@@ -16,43 +86,174 @@ def parse_saas_startups_response(response_text: str) -> List[Dict[str, str]]:
         response_text (str): Raw response from Perplexity API
         
     Returns:
-        List[Dict[str, str]]: List of startup dictionaries
+        List[Startup]: List of startups
     """
     startups = []
     
     try:
         # Try to extract JSON from the response
-        json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            startups = json.loads(json_str)
-        else:
+        startups = extract_json_array(response_text)
+        if startups is None:
             # Fallback: try to parse structured text
             startups = parse_structured_text(response_text)
             
-    except (json.JSONDecodeError, AttributeError) as e:
-        print(f"Error parsing JSON: {e}")
+    except json.JSONDecodeError as e:
+        log.warning("Error parsing JSON: %s", e)
         # Return fallback data if parsing fails
-        startups = get_fallback_data()
+        return get_fallback_data()
+    
+    return validate_startups(startups)
+
+def extract_json_array(text: str) -> Optional[List[Any]]:
+    """
+    Decode the first JSON array of objects embedded in free text
+    
+    Decodes forward from each '[' with JSONDecoder.raw_decode, so the text
+    is scanned in a single pass rather than backtracking from the last ']'.
+    Arrays without any objects (e.g. citation markers like "[1]") are skipped.
+    
+    Args:
+        text (str): Text that may contain a JSON array
+        
+    Returns:
+        Optional[List[Any]]: The decoded array, or None if the text has no '['
+        
+    Raises:
+        json.JSONDecodeError: If the text has a '[' but no array could be decoded
+    """
+    start = text.find('[')
+    if start < 0:
+        return None
+    
+    # Fast path: the span from the first '[' to the last ']' is usually the
+    # whole array, which orjson decodes much faster than the stdlib
+    end = text.rfind(']')
+    if end > start:
+        try:
+            items = orjson.loads(text[start:end + 1])
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            if isinstance(items, list) and any(isinstance(item, dict) for item in items):
+                return items
+    
+    error = None
+    while start >= 0:
+        try:
+            items, end = _JSON_DECODER.raw_decode(text, start)
+        except json.JSONDecodeError as e:
+            error = error or e
+            start = text.find('[', start + 1)
+            continue
+        
+        if any(isinstance(item, dict) for item in items):
+            return items
+        start = text.find('[', end)
+    
+    if error:
+        raise error
+    return []
+
+def validate_startups(startups: List[Any]) -> List[Startup]:
+    """
+    Validate parsed startups and fill in defaults for missing fields
     
-    # Validate and clean the data
+    Args:
+        startups (List[Any]): Parsed startup entries; entries that are not mappings are dropped
+        
+    Returns:
+        List[Startup]: Cleaned startups
+    """
     validated_startups = []
     for startup in startups:
-        if isinstance(startup, dict):
-            validated_startup = {
-                'name': startup.get('name', 'Unknown Startup'),
-                'description': startup.get('description', 'No description available'),
-                'growth_reason': startup.get('growth_reason', 'Growth signals detected'),
-                'source_link': startup.get('source_link', 'https://example.com'),
-                'sector': startup.get('sector', 'Technology'),
-                'funding_stage': startup.get('funding_stage', 'Early Stage'),
-                'signal_type': startup.get('signal_type', 'News'),
-                'score': startup.get('score', 75)
-            }
-            validated_startups.append(validated_startup)
+        # Entries are almost always objects, so try first rather than type-check each one;
+        # only the mapping access is guarded so errors building the Startup still surface
+        try:
+            known_fields = {key: startup[key] for key in _PARSED_FIELDS & startup.keys()}
+        except (TypeError, AttributeError):
+            continue  # Not a mapping, e.g. a bare string or number in the array
+        validated_startups.append(Startup(**known_fields))
     
     return validated_startups
 
+def iter_streamed_startups(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally extract startup objects from a streamed JSON array
+    
+    Each object is yielded as soon as its closing brace arrives, so callers
+    can start processing before the full response has been received, and
+    consumed text is discarded so memory is bounded by a single startup.
+    A malformed element ends its array (with a warning) instead of buffering
+    the rest of the stream.
+    Already-complete strings go through parse_saas_startups_response instead.
+    
+    Args:
+        chunks (Iterable[str]): Response text chunks, in order
+        
+    Yields:
+        Dict[str, Any]: Raw startup dictionaries from the first JSON array holding objects
+    """
+    buffer = ''  # Unparsed text; only ever holds the element currently arriving
+    in_array = False
+    found = False  # Whether the current array has yielded a startup
+    
+    for chunk in chunks:
+        buffer += chunk
+        
+        while True:
+            if not in_array:
+                start = buffer.find('[')
+                if start < 0:
+                    buffer = ''  # Text before an array is never needed
+                    break
+                buffer = buffer[start + 1:]
+                in_array = True
+            
+            # Skip separators between array elements
+            buffer = buffer.lstrip(' \t\r\n,')
+            if not buffer:
+                break
+            
+            if buffer[0] == ']':
+                # Like extract_json_array, only the first array holding objects is used;
+                # anything else (e.g. a citation like "[1]") is skipped
+                if found:
+                    return
+                buffer = buffer[1:]
+                in_array = False
+                continue
+            
+            try:
+                item, end = _JSON_DECODER.raw_decode(buffer)
+            except json.JSONDecodeError as e:
+                if buffer[0] not in '{["':
+                    # Not a JSON value; this bracket was not the start of an array
+                    in_array = False
+                    continue
+                if _is_incomplete_json(e, buffer):
+                    break  # Element not complete yet; wait for more chunks
+                # The error sits before the end of the buffer, so more text cannot fix
+                # it; give up on this array rather than buffering the rest of the stream
+                log.warning("Malformed element in streamed JSON array: %s", e)
+                if found:
+                    return
+                buffer = buffer[1:]
+                in_array = False
+                continue
+            
+            # Drop the decoded element so memory stays bounded by one startup
+            buffer = buffer[end:]
+            if isinstance(item, dict):
+                found = True
+                yield item
+
+def _is_incomplete_json(error: json.JSONDecodeError, text: str) -> bool:
+    """Whether a decode error could be resolved by appending more text"""
+    # Errors from a truncated value point at (or just before) the end of the text,
+    # e.g. a partial literal like "tru"; unterminated strings point at their start
+    return (error.pos >= len(text) - _MAX_PARTIAL_TOKEN
+            or error.msg.startswith('Unterminated string'))
+
 def parse_structured_text(text: str) -> List[Dict[str, str]]:
     """
     Parse structured text response when JSON parsing fails
@@ -66,17 +267,17 @@ def parse_structured_text(text: str) -> List[Dict[str, str]]:
     startups = []
     
     # Split by startup entries (look for numbered lists or bullet points)
-    entries = re.split(r'\n\d+\.|\n•|\n-', text)
+    entries = _ENTRY_SPLIT_RE.split(text)
     
     for entry in entries:
         if not entry.strip():
             continue
             
         # Extract startup information using regex patterns
-        name_match = re.search(r'Name[:\s]+([^\n]+)', entry, re.IGNORECASE)
-        desc_match = re.search(r'Description[:\s]+([^\n]+)', entry, re.IGNORECASE)
-        reason_match = re.search(r'Reason[:\s]+([^\n]+)', entry, re.IGNORECASE)
-        source_match = re.search(r'Source[:\s]+([^\n]+)', entry, re.IGNORECASE)
+        name_match = _NAME_RE.search(entry)
+        desc_match = _DESC_RE.search(entry)
+        reason_match = _REASON_RE.search(entry)
+        source_match = _SOURCE_RE.search(entry)
         
         if name_match:
             startup = {
@@ -93,180 +294,206 @@ def parse_structured_text(text: str) -> List[Dict[str, str]]:
     
     return startups
 
-def get_fallback_data() -> List[Dict[str, Any]]:
+# Dummy startups used when the API fails or is rate limited (frozen: never
+# mutate; get_fallback_data builds new records from them)
+_FALLBACK_DATA = (
+    {
+        'name': 'TechFlow Analytics',
+        'description': 'AI-powered business intelligence platform for SMBs',
+        'growth_reason': 'Recent Series A funding of $5M, growing customer base',
+        'source_link': 'https://techcrunch.com/techflow-analytics',
+        'sector': 'Business Intelligence',
+        'funding_stage': 'Series A',
+        'signal_type': 'Funding',
+        'score': 85
+    },
+    {
+        'name': 'CloudSync Pro',
+        'description': 'Enterprise-grade file synchronization solution',
+        'growth_reason': 'Major partnership with Microsoft, expanding team',
+        'source_link': 'https://venturebeat.com/cloudsync-pro',
+        'sector': 'Cloud Computing',
+        'funding_stage': 'Seed',
+        'signal_type': 'Partnership',
+        'score': 78
+    },
+    {
+        'name': 'DataVault Security',
+        'description': 'Zero-trust cybersecurity platform for enterprises',
+        'growth_reason': 'Increased demand post-cyber attacks, new product launch',
+        'source_link': 'https://techcrunch.com/datavault-security',
+        'sector': 'Cybersecurity',
+        'funding_stage': 'Early Stage',
+        'signal_type': 'Market Demand',
+        'score': 92
+    },
+    {
+        'name': 'GreenTech Solutions',
+        'description': 'Sustainability tracking software for manufacturing',
+        'growth_reason': 'Regulatory compliance requirements, ESG focus',
+        'source_link': 'https://greenbiz.com/greentech-solutions',
+        'sector': 'Sustainability',
+        'funding_stage': 'Seed',
+        'signal_type': 'Regulatory',
+        'score': 80
+    },
+    {
+        'name': 'HealthAI Connect',
+        'description': 'AI-powered patient care coordination platform',
+        'growth_reason': 'Healthcare digitization trends, pilot with major hospital',
+        'source_link': 'https://healthcareitnews.com/healthai-connect',
+        'sector': 'Healthcare',
+        'funding_stage': 'Series A',
+        'signal_type': 'Industry Trend',
+        'score': 88
+    },
+    {
+        'name': 'EduTech Pro',
+        'description': 'Personalized learning platform for K-12 education',
+        'growth_reason': 'Remote learning adoption, government contracts',
+        'source_link': 'https://edtechmagazine.com/edutech-pro',
+        'sector': 'Education',
+        'funding_stage': 'Early Stage',
+        'signal_type': 'Government',
+        'score': 75
+    },
+    {
+        'name': 'FinFlow Analytics',
+        'description': 'Real-time financial data analysis for traders',
+        'growth_reason': 'Market volatility, institutional interest',
+        'source_link': 'https://fintechnews.com/finflow-analytics',
+        'sector': 'Fintech',
+        'funding_stage': 'Seed',
+        'signal_type': 'Market Opportunity',
+        'score': 82
+    },
+    {
+        'name': 'LogiChain Pro',
+        'description': 'Supply chain optimization using blockchain',
+        'growth_reason': 'Global supply chain disruptions, Fortune 500 pilots',
+        'source_link': 'https://supplychaindive.com/logichain-pro',
+        'sector': 'Logistics',
+        'funding_stage': 'Series A',
+        'signal_type': 'Market Disruption',
+        'score': 79
+    },
+    {
+        'name': 'RetailAI Insights',
+        'description': 'AI-powered retail analytics and customer insights',
+        'growth_reason': 'E-commerce growth, major retail partnerships',
+        'source_link': 'https://retailwire.com/retailai-insights',
+        'sector': 'Retail',
+        'funding_stage': 'Early Stage',
+        'signal_type': 'Partnership',
+        'score': 76
+    },
+    {
+        'name': 'EnergyGrid Optimizer',
+        'description': 'Smart grid management and energy optimization',
+        'growth_reason': 'Renewable energy transition, government incentives',
+        'source_link': 'https://energynews.com/energygrid-optimizer',
+        'sector': 'Energy',
+        'funding_stage': 'Seed',
+        'signal_type': 'Policy',
+        'score': 84
+    }
+)
+
+# The fallback data is fixed, so it is serialized once at import time
+_FALLBACK_JSON = orjson.dumps(_FALLBACK_DATA)
+
+def get_fallback_data() -> List[Startup]:
     """
     Return fallback data when API fails or rate limited
     
     Returns:
-        List[Dict[str, Any]]: List of dummy startup data
+        List[Startup]: List of dummy startups
     """
-    return [
-        {
-            'name': 'TechFlow Analytics',
-            'description': 'AI-powered business intelligence platform for SMBs',
-            'growth_reason': 'Recent Series A funding of $5M, growing customer base',
-            'source_link': 'https://techcrunch.com/techflow-analytics',
-            'sector': 'Business Intelligence',
-            'funding_stage': 'Series A',
-            'signal_type': 'Funding',
-            'score': 85
-        },
-        {
-            'name': 'CloudSync Pro',
-            'description': 'Enterprise-grade file synchronization solution',
-            'growth_reason': 'Major partnership with Microsoft, expanding team',
-            'source_link': 'https://venturebeat.com/cloudsync-pro',
-            'sector': 'Cloud Computing',
-            'funding_stage': 'Seed',
-            'signal_type': 'Partnership',
-            'score': 78
-        },
-        {
-            'name': 'DataVault Security',
-            'description': 'Zero-trust cybersecurity platform for enterprises',
-            'growth_reason': 'Increased demand post-cyber attacks, new product launch',
-            'source_link': 'https://techcrunch.com/datavault-security',
-            'sector': 'Cybersecurity',
-            'funding_stage': 'Early Stage',
-            'signal_type': 'Market Demand',
-            'score': 92
-        },
-        {
-            'name': 'GreenTech Solutions',
-            'description': 'Sustainability tracking software for manufacturing',
-            'growth_reason': 'Regulatory compliance requirements, ESG focus',
-            'source_link': 'https://greenbiz.com/greentech-solutions',
-            'sector': 'Sustainability',
-            'funding_stage': 'Seed',
-            'signal_type': 'Regulatory',
-            'score': 80
-        },
-        {
-            'name': 'HealthAI Connect',
-            'description': 'AI-powered patient care coordination platform',
-            'growth_reason': 'Healthcare digitization trends, pilot with major hospital',
-            'source_link': 'https://healthcareitnews.com/healthai-connect',
-            'sector': 'Healthcare',
-            'funding_stage': 'Series A',
-            'signal_type': 'Industry Trend',
-            'score': 88
-        },
-        {
-            'name': 'EduTech Pro',
-            'description': 'Personalized learning platform for K-12 education',
-            'growth_reason': 'Remote learning adoption, government contracts',
-            'source_link': 'https://edtechmagazine.com/edutech-pro',
-            'sector': 'Education',
-            'funding_stage': 'Early Stage',
-            'signal_type': 'Government',
-            'score': 75
-        },
-        {
-            'name': 'FinFlow Analytics',
-            'description': 'Real-time financial data analysis for traders',
-            'growth_reason': 'Market volatility, institutional interest',
-            'source_link': 'https://fintechnews.com/finflow-analytics',
-            'sector': 'Fintech',
-            'funding_stage': 'Seed',
-            'signal_type': 'Market Opportunity',
-            'score': 82
-        },
-        {
-            'name': 'LogiChain Pro',
-            'description': 'Supply chain optimization using blockchain',
-            'growth_reason': 'Global supply chain disruptions, Fortune 500 pilots',
-            'source_link': 'https://supplychaindive.com/logichain-pro',
-            'sector': 'Logistics',
-            'funding_stage': 'Series A',
-            'signal_type': 'Market Disruption',
-            'score': 79
-        },
-        {
-            'name': 'RetailAI Insights',
-            'description': 'AI-powered retail analytics and customer insights',
-            'growth_reason': 'E-commerce growth, major retail partnerships',
-            'source_link': 'https://retailwire.com/retailai-insights',
-            'sector': 'Retail',
-            'funding_stage': 'Early Stage',
-            'signal_type': 'Partnership',
-            'score': 76
-        },
-        {
-            'name': 'EnergyGrid Optimizer',
-            'description': 'Smart grid management and energy optimization',
-            'growth_reason': 'Renewable energy transition, government incentives',
-            'source_link': 'https://energynews.com/energygrid-optimizer',
-            'sector': 'Energy',
-            'funding_stage': 'Seed',
-            'signal_type': 'Policy',
-            'score': 84
-        }
-    ]
+    # format_startup_data mutates entries, so build fresh records each call
+    return [Startup(**startup) for startup in _FALLBACK_DATA]
 
-def calculate_growth_score(startup: Dict[str, str]) -> int:
+def get_fallback_json() -> bytes:
+    """
+    Return fallback data as pre-serialized JSON
+    
+    Returns:
+        bytes: JSON array of the dummy startups, for callers that send JSON
+        onwards and would otherwise build and re-encode the records
+    """
+    return _FALLBACK_JSON
+
+# (keyword, score delta) pairs for calculate_growth_score; the first keyword
+# found in the lowercased field wins, so order matters
+_FUNDING_DELTAS = (('seed', 10), ('series a', 15), ('series b', 20))
+_SIGNAL_DELTAS = (('funding', 15), ('partnership', 12), ('acquisition', 20))
+_SECTOR_DELTAS = (('ai', 8), ('artificial intelligence', 8), ('cybersecurity', 10), ('healthcare', 7))
+
+def _keyword_delta(value: str, deltas: Tuple[Tuple[str, int], ...]) -> int:
+    """Return the delta for the first keyword contained in value, or 0"""
+    for keyword, delta in deltas:
+        if keyword in value:
+            return delta
+    return 0
+
+def calculate_growth_score(startup: Startup) -> int:
     """
     Calculate a growth score based on startup signals
     
     Args:
-        startup (Dict[str, str]): Startup data
+        startup (Startup): Startup data
         
     Returns:
         int: Growth score (0-100)
     """
+    return _score(startup._funding_lc, startup._signal_lc, startup._sector_lc)
+
+@lru_cache(maxsize=1024)
+def _score(funding_stage: str, signal_type: str, sector: str) -> int:
+    """Growth score for lowercased field values; few distinct combinations occur, so it is memoized"""
     score = 50  # Base score
     
-    # Adjust based on funding stage
-    funding_stage = startup.get('funding_stage', '').lower()
-    if 'seed' in funding_stage:
-        score += 10
-    elif 'series a' in funding_stage:
-        score += 15
-    elif 'series b' in funding_stage:
-        score += 20
-    
-    # Adjust based on signal type
-    signal_type = startup.get('signal_type', '').lower()
-    if 'funding' in signal_type:
-        score += 15
-    elif 'partnership' in signal_type:
-        score += 12
-    elif 'acquisition' in signal_type:
-        score += 20
-    
-    # Adjust based on sector
-    sector = startup.get('sector', '').lower()
-    if 'ai' in sector or 'artificial intelligence' in sector:
-        score += 8
-    elif 'cybersecurity' in sector:
-        score += 10
-    elif 'healthcare' in sector:
-        score += 7
+    # Adjust based on funding stage, signal type and sector
+    score += _keyword_delta(funding_stage, _FUNDING_DELTAS)
+    score += _keyword_delta(signal_type, _SIGNAL_DELTAS)
+    score += _keyword_delta(sector, _SECTOR_DELTAS)
     
     return min(100, max(0, score))
 
-def format_startup_data(startups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def format_startup_data(startups: List[Startup],
+                        top_k: Optional[int] = None,
+                        timestamp: Optional[str] = None) -> List[Startup]:
     """
     Format startup data for display with calculated scores
     
     Args:
-        startups (List[Dict[str, Any]]): Raw startup data
+        startups (List[Startup]): Raw startup data
+        top_k (Optional[int]): Only return the top_k highest-scoring startups
+        timestamp (Optional[str]): Batch timestamp to stamp on every startup;
+            defaults to the current time
         
     Returns:
-        List[Dict[str, Any]]: Formatted startup data with scores
+        List[Startup]: Formatted startup data with scores, highest first
     """
     formatted_startups = []
     
+    # One timestamp for the whole batch
+    if timestamp is None:
+        timestamp = datetime.now().isoformat()
+    
     for startup in startups:
         # Calculate growth score if not present
-        if 'score' not in startup:
-            startup['score'] = calculate_growth_score(startup)
+        if startup.score is None:
+            startup.score = calculate_growth_score(startup)
         
         # Add timestamp
-        startup['timestamp'] = datetime.now().isoformat()
+        startup.timestamp = timestamp
         
         formatted_startups.append(startup)
     
-    # Sort by score (highest first)
-    formatted_startups.sort(key=lambda x: x['score'], reverse=True)
+    # Sort by score (highest first); a heap avoids a full sort when only the top few are needed
+    if top_k is not None:
+        return nlargest(top_k, formatted_startups, key=attrgetter('score'))
+    
+    formatted_startups.sort(key=attrgetter('score'), reverse=True)
     
     return formatted_startups 
\ No newline at end of file